@@ -1,55 +1,530 @@
+import os
 import re
+import mmap
 from pathlib import Path
-from regex_patterns import ref_string, hchars, gchars
+from itertools import groupby, islice
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from regex_patterns import ref_bytes, hchars, gchars
 from datetime import datetime
 
+def _read_lines(file):
+    """Reads a file into a list of lines as bytes, slicing them from a memory map.
+
+    The data is ASCII transliteration, so the patches work on bytes and skip
+    decoding entirely; mapping the file means lines are copied out of the
+    page cache one at a time, never as one whole-file object. Lines are
+    split as `file.read_text().split('\\n')` would split them after
+    universal-newline translation, including the empty final line left by
+    a trailing newline.
+
+    Since the patterns only behave as they would on text when every
+    character is a single byte, a non-ASCII line raises an exception
+    naming the file and the (0-indexed) line.
+    """
+    with file.open('rb') as infile:
+        if not os.fstat(infile.fileno()).st_size:
+            return [b''] # empty files cannot be mapped
+        lines = []
+        extend = lines.extend
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b''):
+                if not line.isascii():
+                    raise Exception(f'NON-ASCII DATA IN {file.name} at line {len(lines)}: {line!r}')
+                extend(line.splitlines())
+    if line.endswith((b'\n', b'\r')):
+        lines.append(b'')
+    return lines
+
+def _decode(line):
+    """Decodes bytes for the console and log reports."""
+    return line.decode('utf-8', 'backslashreplace')
+
+def _compile_edits(edits):
+    """Prepares manual edits for application to lines read as bytes.
+
+    An empty filename is resolved to the previous edit's filename; the
+    confirmation patterns are compiled and both they and the redactions
+    are encoded to match the lines. The original edit tuple is kept last,
+    so that reports show the edit as it is written in the edit list.
+    """
+    compiled = []
+    file = ''
+    for edit in edits:
+        edit_file, ln, re_confirm, redaction = edit
+        file = edit_file or file
+        compiled.append((file, ln, re.compile(re_confirm.encode('ascii')), redaction.encode('ascii'), edit))
+    return compiled
+
+# an unescaped `|` anywhere in a pattern, inside or outside of a set
+_alternation = re.compile(rb'(?<!\\)(?:\\\\)*\|')
+
+def _literal_prefix(pattern):
+    """Returns the literal bytes that every match of a regex pattern must begin with.
+
+    Used as a cheap `in` test before running the regex. The pattern is read
+    conservatively: the prefix stops at the first special character, escape
+    class, or quantified character, and patterns with an alternation get
+    no prefix at all.
+    """
+    if _alternation.search(pattern):
+        return b''
+    prefix = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i:i+1]
+        if char == b'\\':
+            char = pattern[i+1:i+2]
+            if not char or char.isalnum():
+                break
+            step = 2
+        elif char in b'.^$*+?{}[]()|' and not (char == b'{' and i == 0):
+            break
+        else:
+            step = 1
+        if pattern[i+step:i+step+1] in (b'*', b'?', b'{'):
+            break
+        prefix.append(char)
+        i += step
+    return b''.join(prefix)
+
+def _compile_normalizations(char_normalizations, normalizations):
+    """Prepares the bulk normalizations for application to lines read as bytes.
+
+    Returns a tuple of (char_normalizations, char_map, normalizations,
+    any_normalization): the encoded character replacements and their
+    translation table, the compiled regex normalizations paired with their
+    replacements and literal prefixes, and the combined screening pattern.
+    """
+    char_normalizations = [(char.encode('ascii'), replace.encode('ascii')) for char, replace in char_normalizations]
+    char_map = bytes.maketrans(
+        b''.join(char for char, _ in char_normalizations),
+        b''.join(replace for _, replace in char_normalizations),
+    )
+    normalizations = [(re.compile(search.encode('ascii')), replace.encode('ascii')) for search, replace in normalizations]
+
+    # each pattern is paired with a literal that its matches must begin with
+    # (often empty), so lines lacking it can skip the pattern without a regex call
+    normalizations = [(search, replace, _literal_prefix(search.pattern)) for search, replace in normalizations]
+
+    # since the patterns must apply in order, a single alternation cannot do the
+    # substitutions; but if none of them matches the original line, none can
+    # match at any later step either, so one scan of the combined set is enough
+    # to rule out the (vast) majority of lines
+    any_normalization = re.compile(b'|'.join(b'(?:' + search.pattern + b')' for search, *_ in normalizations))
+    return char_normalizations, char_map, normalizations, any_normalization
+
+def _write_files(file2lines, output_dir, max_workers=8):
+    """Writes each file's lines to output_dir, overlapping the writes in threads.
+
+    The writes are I/O-bound and release the GIL, so several files can be
+    flushed to disk at once. Lines are streamed through a large write buffer
+    rather than joined into one big bytes object first.
+    """
+    def write(item):
+        file, lines = item
+        with output_dir.joinpath(file).open('wb', buffering=1<<20) as outfile:
+            # same bytes as b'\n'.join(lines), without the peak-memory spike
+            if lines:
+                outfile.write(lines[0])
+                outfile.writelines(b'\n' + line for line in islice(lines, 1, None))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(write, file2lines.items()))
+
+def _patch_file(file, lines):
+    """Repairs orphaned lines and applies the bulk normalizations to one file.
+
+    Runs in a worker process for patch_parallel; see the comments there for
+    a description of the orphaned lines. Returns a tuple of
+    (file, new_lines, log messages, number of edits, hits per normalization),
+    where the hits list the character normalizations before the regex ones.
+    """
+    char_normalizations, char_map, normalizations, any_normalization = _NORMS_COMPILED
+    log = []
+    report = log.append
+    n_edits = 0
+    n_chars = len(char_normalizations)
+    pattern_hits = [0] * (n_chars + len(normalizations))
+
+    # orphan repair can only shorten a file, so the new lines are written
+    # into a list of the original length and truncated at the end
+    new_lines = [None] * len(lines)
+    n_kept = 0
+    current_verse = None
+    in_psalms = False
+    curr_verse = b''
+    ref_match = ref_bytes.match # bind hot-loop lookups to locals
+    screen = any_normalization.search
+
+    # the kept line awaiting normalization, and any orphans shifted up onto it;
+    # these are only joined once the line is complete
+    pending = None
+    pending_tail = None
+
+    def flush():
+        # normalize the completed pending line and add it to the new lines
+        nonlocal curr_verse, n_edits, n_kept, pending_tail
+        if pending is None:
+            return
+        if pending_tail is None:
+            line = pending
+        else:
+            line = b''.join(pending_tail)
+            pending_tail = None
+
+        # track passages for reporting since line numbers have already changed
+        if b'\t' not in line and ref_match(line):
+            curr_verse = line
+
+        # single-character normalizations come first, in one C-level scan
+        redaction = line.translate(char_map)
+        if redaction != line:
+            for j, (char, replace) in enumerate(char_normalizations):
+                if char in line:
+                    report(f'  in {file} in {_decode(curr_verse)} with `{_decode(char)}` -> `{_decode(replace)}`:')
+                    pattern_hits[j] += 1
+                    n_edits += 1
+            report(f'\tOLD: {_decode(line)}')
+            report(f'\tNEW: {_decode(redaction)}')
+            line = redaction
+
+        if screen(line):
+            for j, (search, replace, literal) in enumerate(normalizations, n_chars):
+                if literal not in line: # `in` is far cheaper than running the regex
+                    continue
+                redaction, n_subs = search.subn(replace, line)
+                if n_subs:
+                    report(f'  in {file} in {_decode(curr_verse)} with `{_decode(search.pattern)}` -> `{_decode(replace)}`:')
+                    report(f'\tOLD: {_decode(line)}')
+                    report(f'\tNEW: {_decode(redaction)}')
+                    pattern_hits[j] += 1
+                    n_edits += 1
+                    line = redaction
+
+        new_lines[n_kept] = line
+        n_kept += 1
+
+    lines_iter = enumerate(lines)
+    for i, line in lines_iter:
+
+        # data lines are by far the most common and are kept unchanged;
+        # reference lines never contain a tab, so the cheap test goes first
+        if b'\t' in line:
+            flush()
+            pending = line
+
+        # track references and keep them
+        elif ref_match(line):
+            current_verse = line
+            in_psalms = line.startswith(b'Ps') # constant until the next reference
+            flush()
+            pending = line
+        
+        # apply corrections to relevant lines
+        elif line:
+            
+            # append to log and report which lines are involved
+            show = f'\n\t\t{_decode(lines[i-1])}\n\t--> {_decode(line)}\n\t\t{_decode(lines[i+1])}'
+            report(f'\tpatching {file} at line {i}, {_decode(current_verse)}:{show}')
+            n_edits += 1
+
+            # shift line down to HB col if it's in Psalms
+            if in_psalms:
+                flush()
+                pending = line + next(lines_iter)[1] # also consumes the merged line
+
+            # otherwise shift it up to GK col
+            else:
+                if pending_tail is None:
+                    pending_tail = [pending]
+                pending_tail.append(line)
+
+        # keep blank lines unchanged
+        else:
+            flush()
+            pending = line
+
+    flush()
+    del new_lines[n_kept:]
+
+    return file, new_lines, log, n_edits, pattern_hits
+
+# -- Manual Edits --
+
+# manual corrections loaded into tuples consisting of:
+# (file, line_number, regex condition, new line)
+# where line numbers refer to the original line numbers in the docs,
+# the regex condition is a pattern to search all in the line to confirm the 
+# change (a safeguard for erroneous changes or for when the underlying data
+# changes). All of the changes are enacted in a large loop.
+# If filename is left empty, the previous filename is used
+# NB: linenumbers are given as 0-indexed
+parallel_edits = [
+    ('06.JoshB.par', 983, 'MRY KAI', 'W/)T H/GRG$Y ^ =W/)T W/H/)MRY\t KAI\\ TO\\N AMORRAI=ON '),
+    ('', 1366, '\.kb # KAI', 'W/H/KHNYM =W/H/)BNYM .m .kb #\t KAI\\ OI( LI/QOI '),
+    ('', 3737, '12 E', 'W/YC+YRW =;W/YC+YDW .rd <9.12>\t E)PESITI/SANTO {d} KAI\\ H(TOIMA/SANTO'), 
+    ('', 9517, '<19.49> E', "--+ '' =;L/GBWLWT/YHM <19.49>\t E)N TOI=S O(RI/OIS AU)TW=N "),
+    ('', 2006, '\t<6.20>\t', '-+ =;H/(YR/H <6.20>\tEI)S TH\\N PO/LIN '),
+    ('', 9515, '\t<19\.49>\t', "--+ '' =;M/XLQ <19.49>\tDIAMERI/SAS "),
+    ('', 7104, 'RNA.*\t', 'W/DNH =:W/RNH .dr\tKAI\ RENNA'),
+    ('', 1659, '----', "M/MCRYM\t--- ''"),
+    ('', 4673, '{=51}', "W/YMYT/M\t--- <=51>"), # Normalize this to a note
+    ('', 10235, '{TOU', "--+\tSALAMIN {d} {...TOU= SWTHRI/OU}"),
+    ('', 11304, 'A\)PO\|', "M/CPWN\tA)PO\ BORRA= [31] "),
+    ('07.JoshA.par', 645, ' \)PO', "M/&M)L\tA)PO\ A)RISTERW=N"),
+    ('01.Genesis.par', 9550, "--\+ ' ", "--+ '' =;W/BH <24.14>\tKAI\ E)N TOU/TW|"),
+    ('', 9552, "--\+ ' ", "--+ '' =;KY <24.14>\tO(/TI"),
+    ('', 9557, '=:ABRHM', "--+ =:)BRHM\tABRAAM"),
+    ('', 2316, '--= ', "--+ '' =H/BHMH\tTW=N KTHNW=N"),
+    ('', 12939, '\.a', "B/GLL/K =?B/RGL/YK .s <^30.30\tTH=| SH=| ^ EI)SO/DW|"), # typo: .a for .s
+    ('', 10822, '}}', "NG(NW/K\t{...H(MEI=S} {...SE} ^ E)BDELUCA/MEQA"),
+    ('17.1Esdras.par', 477, 'CC35\.24', 'W/Y(BYR/HW\tKAI\\ {..^A)PE/STHSAN AU)TO\\N} [cc35.24]'),
+    ('', 6514, 'LI.*\t', ")L(ZR =:)LYW(NY\tE)LIWNA=S [e10.31]"),
+    ('', 2857, '\[e2 10', "$$ M)WT )RB(YM W/$NYM =+\tE(CAKO/SIOI TESSARA/KONTA O)KTW/ [e2.10]"),
+    ('', 772, 'SAS 3', ")$R H$BY(/W\t{...O(RKISQEI\S}{d} E)PIORKH/SAS #"),
+    ('', 4525, 'O.I\(', "BNY GLWT/)\tOI( E)K TH=S AI)XMALWSI/AS [e6.16]"), # remove unknown char
+    ('27.Sirach.par', 4843, '{\.\.}', '[..]\tA)PO\\'),
+    ('', 3697, '\s\s\s\s\s', "#\tA(MARTWLOU=} [7]}"), 
+    ('', 16898, ' no id\.', "NSH[..] 4\t--- ''<c - no id.>"), # put weird note in brackets
+    ('', 14099, '{\.\.\.\)', "<<KY>> 12\t{...}"),
+    ('11.1Sam.par', 2096, 'O\t', "--+ '' =KPWT\tOI( KARPOI\\"),
+    ('', 2097, 'T\t', "--+ '' =;YD/YW\tTW=N XEIRW=N AU)TOU="),
+    ('12.2Sam.par', 8592, 'EI\)S\)', "H/&DH =;H/Y(R\t{..pEI)S} TO\\N DRUMO\\N"),
+    ('13.1Kings.par', 15936, 'EI\)S}\t', "W/YBW)\tKAI\ EI)SH=LQEN {...EI)S}"),
+    ('', 2987, 'GY', "MCRYM\tAI)GU/PTOU [2.46k,10.26a]"),
+    ('14.2Kings.par', 4735, '{c}\? ', "YNHG\tE)GE/NETO {c?H)=GEN}"),
+    ('40.Isaiah.par', 1855, 'E\t', "B/$LKT =;M$LKT <q1a>\tE)KPE/SH|"),
+    ('', 11657, '_', "B/M(LWT\t--- ?"),
+    ('', 18586, '\.\.\.TO', "W/L/QDW$\tTO\ A(/GION {d} {..^KAI\ DIA\}{..^TO|N"),
+    ('', 11769, '=XWHa,XYY', "YXYW =@XWHa =@XYY\tA)NHGGE/LH {d} {...KAI\ E)CHGEIRA/S}"),
+    ('26.Job.par', 2245, 'OU\)}\t', "W/L)\t{..^OU)}DE\\"),
+    ('', 2063, '=a', "$DY =@$/DYa\tO( TA\ PA/NTA POIH/SAS"),
+    ('', 7441, '{#}', "YMYN\tDECIW=N {---%}"),
+    ('', 7927, 'S\.\.\^', "W/T$Q\tEI) DE\ KAI\ {..^EPIQEI\S}{..^E)FI/LHSA}"),
+    ('', 7615, '{c\?}', "XMH =?@XSM,@ZMMa [[30:11]]\tFIMOU= {c?QUMOU=}"),
+    ('', 7535, 'KRATAI', "B/(CM\t{..^KRATAIA=|}"),
+    ('44.Ezekiel.par', 471, 'OU=} MDBR', "MDBR =v\t{...?AU)TOU=} LALOU=NTOS"),
+    ('', 18162, '<42\.9\)', "--+ =;L/HNH <42.9>\tDI' AU)TW=N"),
+    ('', 20424, '\s\s\s\s\s', "NTNW #\tDE/DONTAI #"),
+    ('', 16686, r'XEIR\\', "^^^ ^ =W/B/YD/W\tKAI\ E)N TH=| XEI\R AU)TOU="),
+    ('', 8218, '\+RAUS\+', "L/MWG =%vap\tQRAUSQH=|"),
+    ('16.2Chron.par', 10095, '\t---$', "MLK\t--- ''"),
+    ('', 10096, '\t---$', "B/YRW$LM\t--- ''"),
+    ('', 1522, 'W:', "L/YHWH\tTW=| KURI/W|"),
+    ('', 3575, '-\.-', ''), # erase redundant line
+    ('', 4093, '{TOU', "W/B/BNYMN\tKAI\ {cTOU=} BENIAMIN"),
+    ('02.Exodus.par', 18838, '<40\.9}', '--+ '' {x} =;B/W <40.9>\tAU)TH=S'), 
+    ('', 3197, '\s\s\s\s\s', "--+ =HW) <sp>\tAU)TO\S"), 
+    ('04.Num.par', 7479, '<de1\.39\)', "--+ '' =;)$R <de1.39>\tO(/SOI"),
+    ('20.Psalms.par', 21382, '{\.1\.d', "W/M/PZ\tKAI\ {..dU(PE\R} TOPA/ZION [118.127]"),
+    ('', 8991, '\*YCPYNW\*', "**YCPYNW *YCPWNW\tKAI\ KATAKRU/YOUSIN [55.7]"),
+    ('', 21484, 'Y\*', "CR/Y\tOI( E)XQROI/ MOU [118.139]"),
+    ('', 7997, 'PROS/', "W/)L\tKAI\ {..dPRO/S} [49.4]"),
+    ('', 8968, r'TOUS\\', "DBR/W\tTOU\S LO/GOUS MOU [55.5]"),
+    ('23.Prov.par', 89, 'c18\.7\s', 'W/(NQYM <ju8.26 ge41.42 c18.7>\tKAI\ KLOIO\\N XRU/SEON'),
+    ('', 3274, 'ER\t', "{...}\tW(/SPER"),
+    ('', 3317, '{c} ', "YQB/HW =?@$BQa\tU(POLI/POITO {cU(POLH/NION} AU)TO\\N"),
+    ('', 3482, '\^EN\)', "MCWD =MCWR .dr\t{..^E)N} O)XURW/MASIN}"),
+    ('', 7090, r'G\\AR', "KY\tGA\R"),
+    ('', 8517, r'A\|\(', "$)WL\tA(/|DHS"),
+    ('03.Lev.par', 6866, '<sp\^\s', "--+ '' =;B/W <nu19.13> <sp^> #\tE)N AU)TW=|"),
+    ('', 12382, '{\.\.\.L\)\t', "W/PSL {...L)}\tOU)DE\ GLUPTA\\"),
+    ('41.Jer.par', 4751, '--\t', "H(D {!}-\t--- ''"),
+    ('', 4752, '--\t', "H(DTY {!}-\t--- ''"),
+    ('05.Deut.par', 11173, 'KI.*\t', "--+ '' =;KY <24.22>\tO(/TI"),
+    ('', 13270, 'Deut 28:65', 'Deut 28:64'), 
+    ('', 13293, '\s\*', "^ W/)BN\t^^^\n\nDeut 28:65"),
+    ('', 2297, 'Deut 4:26', 'Deut 4:25'),
+    ('', 2316, '\(YD', "\nDeut 4:26\nH(YDTY\tDIAMARTU/ROMAI"),
+    ('08.JudgesB.par', 8041, r'N\.\.\.\)T', 'W/TY$N/HW =W/TY$N {...)T $M$WN}\tKAI\ E)KOI/MISEN {...TO\\N SAMYWN}'),
+    ('', 7568, '=@a\+', "=@+R)a\tE)KRERIMME/NHN"),
+    ('', 8151, ' %vpa', "W/YCXQ =%vpa {d}\tKAI\ E)/PAIZEN {d} {...KAI\ E)RRA/PIZON}"),
+    ('30.Amos.par', 603, '\[c', "B/)RC\tTH=S ---  {cGH=S}"),
+    ('', 751, '\[c', ")$H\tGUMNAI\ {cGUNAI=KES}"),
+    ('18.Esther.par', 4779, 'TH=!', "--+ ''\tTH=| TESSARESKAIDEKA/TH|"),
+    ('19.Neh.par', 1663, 'MEneN', "K/H/YWM\tW(S SH/MERON"),
+    ('', 3198, '{c\?}', "$(R =?(YR\tTH=S PO/LEWS {c?PU/LHS}"),
+    ('', 166, '{\*\*\t', "*W/HBW)TY/M **W/HBY)WTY/M {**}\tKAI\ EI)SA/CW AU)TOU\S"),
+    ('45.DanielOG.par', 7333, '{\?}', "YMYM\t--- <?>"),
+    ('', 2883, 'Q/Q', "(L M$KB/Y ,,a\tE)KA/QEUDON [10]"),
+    ('43.Lam.par', 1587, 'A \)', "+M)\tA)KAQA/RTWN"),
+]
+
+# select changes to the morphology files, in the same format
+morpho_edits = [
+    ('01.Gen.1.mlxx', 12540, 'ADI2P', "KAQI/SATE                VA  AAD2P  I(/ZW            KATA"),
+    ('05.Num.mlxx', 24859, 'SONTAIVC', "SUGKATAKLHRONOMHQH/SONTAI VC  APS2S  KLHRONOME/W      SUN   KATA"),
+]
+
+# -- Bulk Normalizations -- 
+
+# changes which need to be effected systematically are loaded into tuples:
+# (regex, replace)
+# the changes are enacted with regex substitutions
+# not all of these are stricly errors (though they may be), there 
+# are numerous cases of normalizations applied to bring idiosyncratic
+# patterns in line with the majority
+
+# single-character replacements are kept apart, since they can be made
+# with a translation table rather than a regex; they are applied first
+char_normalizations = [
+    ('~', '^'),
+]
+
+# NB that the order of some changes matters, since some patterns are 
+# dependent on other idiosyncracies being fixed already
+normalizations = [
+    ('----\+---', "--- ''"), # see 2 Chr 27:8
+    ("---\+", "--+"),
+    ("<([^\s>]*)(\s)(?!.*[>#])", '<\g<1>>\g<2>'), # numerous unclosed brackets
+
+    # NB: on below, cases of `{..`; some cases may be ambiguous whether they should be 
+    # {... or {..^ However, it is the stated preference of the docs that 
+    # during encoding {... is to be preferred (1986:7.6)
+    # and it also seems that several of the examples have a majority 
+    # preference of {... over {..^; thus we go with the former
+    ('{\.\.(?![.^a-z])', '{...'),
+    ('\.\.\.\.', '...'),
+    ('\(!\)', '{!}'), # (!) to {i}, inf. abs.
+    ('(?<![-*])\-\+', '--+'), # -+ to --+
+    ('A(?=.*\t)', ''), # vowels in the Hebrew column, replace with nothing
+    ('=&p', '=%p'), # =&p typo for =%p, preposition differences
+    ('(?<!-)--(?![-+])', '---'), # -- to ---
+    ('=a', '=@a'),
+
+    # NB order of this block matters, to ensure space to left of =
+    ('=%p=', '=%p-'),
+    ('([:;])=', '=\g<1>'), # e.g. := to =:
+    ('([^A-Z\/()\s|{}])=', '\g<1> ='), # ensure space to left of = (col.B marker)
+
+    # this is case of ellision with interruption
+    # it would be more consistent to code it as a separate {...} remark
+    # so we close the previous brace and adda second
+    ('(?<![{\[])\.\.\.(?![}\]])', '}{...'),
+
+    ('=%pa', '=%vpa'),
+    ('-%vap', '=%vap'),
+    ('{\.\.\.r', '{..r'),
+    ('=p(?=[\s-])', '=%p'),
+    ('<Sp>', '<sp>'),
+    ('=vpa', '=%vpa'),
+    ('{d}%p(\+?)', '%p\g<1> {d}'),
+    ('\+;', '=;'),
+
+    ('=\?:', '=:?'),
+    ('={d};', '=;{d}'),
+
+    ('=p%([-+\s])', '=%p\g<1>'),
+    ('{d\t', '{d}\t'),
+    ('{15{', '{15}'),
+    ('\(\?5\)', '{?5}'), 
+    ('\[\.\.\.\]', '[..]'),
+    ('{(\d+)(\s)', '{\g<1>}\g<2>'),
+    ('(\s)(\d+)}', '\g<1>{\g<2>}'),
+    ('=%\?p(-?)', '=%p\g<1>?'),
+    (' ([a-z][a-z]) (?=.*\t)', ' .\g<1> '),
+    ('\(\.\.', '{..'),
+    (r'\\(?=.*\t)', '/'),
+
+    # order of block matters here
+    ('\[([a-zA-Z])}', '{\g<1>}'),
+    ('\[([\d.a-z]+)(?!.*\])', '[\g<1>]'),
+
+    ('\s\s\s\s+', ' '),
+    ('{\.\.\.\^', '{..^'),
+    ('{\.\.\^\.', '{..^'),
+    ('{\.\.\.([a-z]+)', '{..\g<1>'),
+    ('{t\.}', '{t}'),
+    ('<t\?>', '{t?}'),
+    ('(\s)\?--\+(\s)', '\g<1>--+?\g<2>'),
+
+    # move question marks contained in brackets
+    # to the end of the brackets; this normalizes the `?`
+    # and allows us to treat them as external decorators
+    # rather than allowing them to interrupt a symbol
+    (r"{([^}]*)(\?\??)(.*?)}", "{\g<1>\g<3>}\g<2>"),
+
+    # normalize verse cross references in Hebrew portion
+    #('\[\[(.*[a-zA-Z]+.*\d\..*)\]\](?=.*\t)', '<\g<1>>'),
+    (r"\[\[(.+?)\]\](?=.*\t)", "<\g<1>>"),
+    (r"{dt}", "{d}{t}"),
+
+    # move `?` to end of etymological exegesis symbol
+    (r"=@\?(\S*)a", "=@\g<1>a?"),
+
+    # close up unclosed curly brackets
+    (r"{([^\[}#]+)( +|$)(?!.*[}#])", "{\g<1>}\g<2>"),
+
+    (r"\^\^\^ \^ ''", "^^^ ^"),
+    (r"=([A-Z()/&$+]+)a", "=@\g<1>a"),
+
+    # change brackets of cross references in Hebrew portion to <>
+    # where <...> represents a 'note'
+    ("\[([^\]]*?\d[\]]*?)\](?=.*\t)", "<\g<1>>"),
+
+    # patch misplaced accents
+    (r"(\t.*)(\s)([()])(.)", "\g<1>\g<2>\g<4>\g<3>"),
+    (r"(\t.*)=\)", "\g<1>)="),
+    (r"\|=", "=|"),
+    (r"\|\)", ")|"),
+    (r"TO\|N", r"TO\\N"),
+    (r"KAI\|", r"KAI\\"),
+    (r"I\(MAT/TIA", "I(MA/TIA"),
+    (r"ZN=\|", "ZH=|"),
+    (r"H\)R=TAI", "H)=RTAI"),
+    (r"OY\)K", "OU)K"),
+    (r"EC/NOIS", "CE/NOIS"),
+    (r"TH=/S", "TH=S"),
+]
+
+# compiled once at import, so repeated calls of the patch functions
+# (and each worker process) share the same compiled patterns
+_MORPHO_EDITS_COMPILED = _compile_edits(morpho_edits)
+_EDITS_COMPILED = _compile_edits(parallel_edits)
+_NORMS_COMPILED = _compile_normalizations(char_normalizations, normalizations)
+
 def patch_morpho(data_dir='source', output_dir='source/patched', silent=False, debug=False):
-    log = ''
-    log += datetime.now().__str__() + '\n'
+    log_parts = [datetime.now().__str__()]
 
     n_edits = 0
 
+    # console feedback is decided once rather than on every report
+    sink = (lambda msg: None) if silent else print
+
     def report(msg):
-        # give feedback
-        nonlocal log # see https://stackoverflow.com/a/8178808/8351428
-        log += msg + '\n'
-        if not silent:
-            print(msg)
+        # give feedback; messages are joined once when the log is written
+        log_parts.append(msg)
+        sink(msg)
     
     data = Path(data_dir)
     file2lines = {}
 
     for file in data.glob('*.mlxx'):
-        file2lines[file.name] = file.read_text().split('\n')
+        file2lines[file.name] = _read_lines(file)
 
-    # apply select changes 
-    edits = [
-        ('01.Gen.1.mlxx', 12540, 'ADI2P', "KAQI/SATE                VA  AAD2P  I(/ZW            KATA"),
-        ('05.Num.mlxx', 24859, 'SONTAIVC', "SUGKATAKLHRONOMHQH/SONTAI VC  APS2S  KLHRONOME/W      SUN   KATA"),
-    ]
+    # apply select changes
     report('\napplying bulk manual edits...\n')
 
-    file = ''
-    for edit in edits:
-
-        # unpack data
-        file = edit[0] or file
-        ln, re_confirm, redaction = edit[1:]
-        old_line = file2lines[file][ln]
-
-        # confirm and apply changes, give reports throughout
-        if re.findall(re_confirm, old_line):
-            file2lines[file][ln] = redaction
-            report(f'correction for {file} line {ln}:')
-            report(f'\tOLD: {old_line}')
-            report(f'\tNEW: {redaction}')
-            n_edits += 1
-        else:
-            if debug:
-                raise Exception(f'FOLLOWING EDIT UNCONFIRMED: {edit} at {old_line}')
-            report(f'**WARNING: THE FOLLOWING EDIT WAS NOT CONFIRMED**:')
-            report(f'\tTARGET: {old_line}')
-            report(f'\tEDIT: {edit}')
+    # edits are listed file by file, so each file's lines are looked up once
+    for file, file_edits in groupby(_MORPHO_EDITS_COMPILED, key=itemgetter(0)):
+        lines = file2lines[file]
+        for _, ln, re_confirm, redaction, edit in file_edits:
+            old_line = lines[ln]
+
+            # confirm and apply changes, give reports throughout
+            if re_confirm.search(old_line):
+                lines[ln] = redaction
+                report(f'correction for {file} line {ln}:')
+                report(f'\tOLD: {_decode(old_line)}')
+                report(f'\tNEW: {_decode(redaction)}')
+                n_edits += 1
+            else:
+                if debug:
+                    raise Exception(f'FOLLOWING EDIT UNCONFIRMED: {edit} at {_decode(old_line)}')
+                report(f'**WARNING: THE FOLLOWING EDIT WAS NOT CONFIRMED**:')
+                report(f'\tTARGET: {_decode(old_line)}')
+                report(f'\tEDIT: {edit}')
 
     # export the corrected files
     report(f'\nwriting patched data to {output_dir}')
@@ -57,14 +532,11 @@ def patch_morpho(data_dir='source', output_dir='source/patched', silent=False, d
     if not output_dir.exists():
         output_dir.mkdir()
 
-    for file, lines in file2lines.items():
-        text = '\n'.join(lines)
-        file_path = output_dir.joinpath(file)
-        file_path.write_text(text)
+    _write_files(file2lines, output_dir)
 
     # write changes to a log file
     log_path = output_dir.joinpath('log.txt')
-    log_path.write_text(log)
+    log_path.write_text('\n'.join(log_parts) + '\n')
 
     report('\nDONE with all patches!')
     report(f'\ttotal edits: {n_edits}')
@@ -73,148 +545,49 @@ def patch_morpho(data_dir='source', output_dir='source/patched', silent=False, d
 def patch_parallel(data_dir='source', output_dir='source/patched', silent=False, debug=False):
     """Corrects known errors in the CATSS database."""
 
-    log = ''
-    log += datetime.now().__str__() + '\n'
+    log_parts = [datetime.now().__str__()]
 
     n_edits = 0
 
+    # console feedback is decided once rather than on every report
+    sink = (lambda msg: None) if silent else print
+
     def report(msg):
-        # give feedback
-        nonlocal log # see https://stackoverflow.com/a/8178808/8351428
-        log += msg + '\n'
-        if not silent:
-            print(msg)
+        # give feedback; messages are joined once when the log is written
+        log_parts.append(msg)
+        sink(msg)
     
     data = Path(data_dir)
     file2lines = {}
 
     for file in data.glob('*.par'):
-        file2lines[file.name] = file.read_text().split('\n')
+        file2lines[file.name] = _read_lines(file)
 
     # -- Manual Edits --
 
-    # manual corrections loaded into tuples consisting of:
-    # (file, line_number, regex condition, new line)
-    # where line numbers refer to the original line numbers in the docs,
-    # the regex condition is a pattern to search all in the line to confirm the 
-    # change (a safeguard for erroneous changes or for when the underlying data
-    # changes). All of the changes are enacted in a large loop.
-    # If filename is left empty, the previous filename is used
-    # NB: linenumbers are given as 0-indexed
-    edits = [
-        ('06.JoshB.par', 983, 'MRY KAI', 'W/)T H/GRG$Y ^ =W/)T W/H/)MRY\t KAI\\ TO\\N AMORRAI=ON '),
-        ('', 1366, '\.kb # KAI', 'W/H/KHNYM =W/H/)BNYM .m .kb #\t KAI\\ OI( LI/QOI '),
-        ('', 3737, '12 E', 'W/YC+YRW =;W/YC+YDW .rd <9.12>\t E)PESITI/SANTO {d} KAI\\ H(TOIMA/SANTO'), 
-        ('', 9517, '<19.49> E', "--+ '' =;L/GBWLWT/YHM <19.49>\t E)N TOI=S O(RI/OIS AU)TW=N "),
-        ('', 2006, '\t<6.20>\t', '-+ =;H/(YR/H <6.20>\tEI)S TH\\N PO/LIN '),
-        ('', 9515, '\t<19\.49>\t', "--+ '' =;M/XLQ <19.49>\tDIAMERI/SAS "),
-        ('', 7104, 'RNA.*\t', 'W/DNH =:W/RNH .dr\tKAI\ RENNA'),
-        ('', 1659, '----', "M/MCRYM\t--- ''"),
-        ('', 4673, '{=51}', "W/YMYT/M\t--- <=51>"), # Normalize this to a note
-        ('', 10235, '{TOU', "--+\tSALAMIN {d} {...TOU= SWTHRI/OU}"),
-        ('', 11304, 'A\)PO\|', "M/CPWN\tA)PO\ BORRA= [31] "),
-        ('07.JoshA.par', 645, ' \)PO', "M/&M)L\tA)PO\ A)RISTERW=N"),
-        ('01.Genesis.par', 9550, "--\+ ' ", "--+ '' =;W/BH <24.14>\tKAI\ E)N TOU/TW|"),
-        ('', 9552, "--\+ ' ", "--+ '' =;KY <24.14>\tO(/TI"),
-        ('', 9557, '=:ABRHM', "--+ =:)BRHM\tABRAAM"),
-        ('', 2316, '--= ', "--+ '' =H/BHMH\tTW=N KTHNW=N"),
-        ('', 12939, '\.a', "B/GLL/K =?B/RGL/YK .s <^30.30\tTH=| SH=| ^ EI)SO/DW|"), # typo: .a for .s
-        ('', 10822, '}}', "NG(NW/K\t{...H(MEI=S} {...SE} ^ E)BDELUCA/MEQA"),
-        ('17.1Esdras.par', 477, 'CC35\.24', 'W/Y(BYR/HW\tKAI\\ {..^A)PE/STHSAN AU)TO\\N} [cc35.24]'),
-        ('', 6514, 'LI.*\t', ")L(ZR =:)LYW(NY\tE)LIWNA=S [e10.31]"),
-        ('', 2857, '\[e2 10', "$$ M)WT )RB(YM W/$NYM =+\tE(CAKO/SIOI TESSARA/KONTA O)KTW/ [e2.10]"),
-        ('', 772, 'SAS 3', ")$R H$BY(/W\t{...O(RKISQEI\S}{d} E)PIORKH/SAS #"),
-        ('', 4525, 'O.I\(', "BNY GLWT/)\tOI( E)K TH=S AI)XMALWSI/AS [e6.16]"), # remove unknown char
-        ('27.Sirach.par', 4843, '{\.\.}', '[..]\tA)PO\\'),
-        ('', 3697, '\s\s\s\s\s', "#\tA(MARTWLOU=} [7]}"), 
-        ('', 16898, ' no id\.', "NSH[..] 4\t--- ''<c - no id.>"), # put weird note in brackets
-        ('', 14099, '{\.\.\.\)', "<<KY>> 12\t{...}"),
-        ('11.1Sam.par', 2096, 'O\t', "--+ '' =KPWT\tOI( KARPOI\\"),
-        ('', 2097, 'T\t', "--+ '' =;YD/YW\tTW=N XEIRW=N AU)TOU="),
-        ('12.2Sam.par', 8592, 'EI\)S\)', "H/&DH =;H/Y(R\t{..pEI)S} TO\\N DRUMO\\N"),
-        ('13.1Kings.par', 15936, 'EI\)S}\t', "W/YBW)\tKAI\ EI)SH=LQEN {...EI)S}"),
-        ('', 2987, 'GY', "MCRYM\tAI)GU/PTOU [2.46k,10.26a]"),
-        ('14.2Kings.par', 4735, '{c}\? ', "YNHG\tE)GE/NETO {c?H)=GEN}"),
-        ('40.Isaiah.par', 1855, 'E\t', "B/$LKT =;M$LKT <q1a>\tE)KPE/SH|"),
-        ('', 11657, '_', "B/M(LWT\t--- ?"),
-        ('', 18586, '\.\.\.TO', "W/L/QDW$\tTO\ A(/GION {d} {..^KAI\ DIA\}{..^TO|N"),
-        ('', 11769, '=XWHa,XYY', "YXYW =@XWHa =@XYY\tA)NHGGE/LH {d} {...KAI\ E)CHGEIRA/S}"),
-        ('26.Job.par', 2245, 'OU\)}\t', "W/L)\t{..^OU)}DE\\"),
-        ('', 2063, '=a', "$DY =@$/DYa\tO( TA\ PA/NTA POIH/SAS"),
-        ('', 7441, '{#}', "YMYN\tDECIW=N {---%}"),
-        ('', 7927, 'S\.\.\^', "W/T$Q\tEI) DE\ KAI\ {..^EPIQEI\S}{..^E)FI/LHSA}"),
-        ('', 7615, '{c\?}', "XMH =?@XSM,@ZMMa [[30:11]]\tFIMOU= {c?QUMOU=}"),
-        ('', 7535, 'KRATAI', "B/(CM\t{..^KRATAIA=|}"),
-        ('44.Ezekiel.par', 471, 'OU=} MDBR', "MDBR =v\t{...?AU)TOU=} LALOU=NTOS"),
-        ('', 18162, '<42\.9\)', "--+ =;L/HNH <42.9>\tDI' AU)TW=N"),
-        ('', 20424, '\s\s\s\s\s', "NTNW #\tDE/DONTAI #"),
-        ('', 16686, r'XEIR\\', "^^^ ^ =W/B/YD/W\tKAI\ E)N TH=| XEI\R AU)TOU="),
-        ('', 8218, '\+RAUS\+', "L/MWG =%vap\tQRAUSQH=|"),
-        ('16.2Chron.par', 10095, '\t---$', "MLK\t--- ''"),
-        ('', 10096, '\t---$', "B/YRW$LM\t--- ''"),
-        ('', 1522, 'W:', "L/YHWH\tTW=| KURI/W|"),
-        ('', 3575, '-\.-', ''), # erase redundant line
-        ('', 4093, '{TOU', "W/B/BNYMN\tKAI\ {cTOU=} BENIAMIN"),
-        ('02.Exodus.par', 18838, '<40\.9}', '--+ '' {x} =;B/W <40.9>\tAU)TH=S'), 
-        ('', 3197, '\s\s\s\s\s', "--+ =HW) <sp>\tAU)TO\S"), 
-        ('04.Num.par', 7479, '<de1\.39\)', "--+ '' =;)$R <de1.39>\tO(/SOI"),
-        ('20.Psalms.par', 21382, '{\.1\.d', "W/M/PZ\tKAI\ {..dU(PE\R} TOPA/ZION [118.127]"),
-        ('', 8991, '\*YCPYNW\*', "**YCPYNW *YCPWNW\tKAI\ KATAKRU/YOUSIN [55.7]"),
-        ('', 21484, 'Y\*', "CR/Y\tOI( E)XQROI/ MOU [118.139]"),
-        ('', 7997, 'PROS/', "W/)L\tKAI\ {..dPRO/S} [49.4]"),
-        ('', 8968, r'TOUS\\', "DBR/W\tTOU\S LO/GOUS MOU [55.5]"),
-        ('23.Prov.par', 89, 'c18\.7\s', 'W/(NQYM <ju8.26 ge41.42 c18.7>\tKAI\ KLOIO\\N XRU/SEON'),
-        ('', 3274, 'ER\t', "{...}\tW(/SPER"),
-        ('', 3317, '{c} ', "YQB/HW =?@$BQa\tU(POLI/POITO {cU(POLH/NION} AU)TO\\N"),
-        ('', 3482, '\^EN\)', "MCWD =MCWR .dr\t{..^E)N} O)XURW/MASIN}"),
-        ('', 7090, r'G\\AR', "KY\tGA\R"),
-        ('', 8517, r'A\|\(', "$)WL\tA(/|DHS"),
-        ('03.Lev.par', 6866, '<sp\^\s', "--+ '' =;B/W <nu19.13> <sp^> #\tE)N AU)TW=|"),
-        ('', 12382, '{\.\.\.L\)\t', "W/PSL {...L)}\tOU)DE\ GLUPTA\\"),
-        ('41.Jer.par', 4751, '--\t', "H(D {!}-\t--- ''"),
-        ('', 4752, '--\t', "H(DTY {!}-\t--- ''"),
-        ('05.Deut.par', 11173, 'KI.*\t', "--+ '' =;KY <24.22>\tO(/TI"),
-        ('', 13270, 'Deut 28:65', 'Deut 28:64'), 
-        ('', 13293, '\s\*', "^ W/)BN\t^^^\n\nDeut 28:65"),
-        ('', 2297, 'Deut 4:26', 'Deut 4:25'),
-        ('', 2316, '\(YD', "\nDeut 4:26\nH(YDTY\tDIAMARTU/ROMAI"),
-        ('08.JudgesB.par', 8041, r'N\.\.\.\)T', 'W/TY$N/HW =W/TY$N {...)T $M$WN}\tKAI\ E)KOI/MISEN {...TO\\N SAMYWN}'),
-        ('', 7568, '=@a\+', "=@+R)a\tE)KRERIMME/NHN"),
-        ('', 8151, ' %vpa', "W/YCXQ =%vpa {d}\tKAI\ E)/PAIZEN {d} {...KAI\ E)RRA/PIZON}"),
-        ('30.Amos.par', 603, '\[c', "B/)RC\tTH=S ---  {cGH=S}"),
-        ('', 751, '\[c', ")$H\tGUMNAI\ {cGUNAI=KES}"),
-        ('18.Esther.par', 4779, 'TH=!', "--+ ''\tTH=| TESSARESKAIDEKA/TH|"),
-        ('19.Neh.par', 1663, 'MEneN', "K/H/YWM\tW(S SH/MERON"),
-        ('', 3198, '{c\?}', "$(R =?(YR\tTH=S PO/LEWS {c?PU/LHS}"),
-        ('', 166, '{\*\*\t', "*W/HBW)TY/M **W/HBY)WTY/M {**}\tKAI\ EI)SA/CW AU)TOU\S"),
-        ('45.DanielOG.par', 7333, '{\?}', "YMYM\t--- <?>"),
-        ('', 2883, 'Q/Q', "(L M$KB/Y ,,a\tE)KA/QEUDON [10]"),
-        ('43.Lam.par', 1587, 'A \)', "+M)\tA)KAQA/RTWN"),
-    ]
+    # the corrections are listed in `parallel_edits` at module level, above
 
     report('\napplying bulk manual edits...\n')
 
-    file = ''
-    for edit in edits:
-
-        # unpack data
-        file = edit[0] or file
-        ln, re_confirm, redaction = edit[1:]
-        old_line = file2lines[file][ln]
-
-        # confirm and apply changes, give reports throughout
-        if re.findall(re_confirm, old_line):
-            file2lines[file][ln] = redaction
-            report(f'correction for {file} line {ln}:')
-            report(f'\tOLD: {old_line}')
-            report(f'\tNEW: {redaction}')
-            n_edits += 1
-        else:
-            if debug:
-                raise Exception(f'FOLLOWING EDIT UNCONFIRMED: {edit} at {old_line}')
-            report(f'**WARNING: THE FOLLOWING EDIT WAS NOT CONFIRMED**:')
-            report(f'\tTARGET: {old_line}')
-            report(f'\tEDIT: {edit}')
+    # edits are listed file by file, so each file's lines are looked up once
+    for file, file_edits in groupby(_EDITS_COMPILED, key=itemgetter(0)):
+        lines = file2lines[file]
+        for _, ln, re_confirm, redaction, edit in file_edits:
+            old_line = lines[ln]
+
+            # confirm and apply changes, give reports throughout
+            if re_confirm.search(old_line):
+                lines[ln] = redaction
+                report(f'correction for {file} line {ln}:')
+                report(f'\tOLD: {_decode(old_line)}')
+                report(f'\tNEW: {_decode(redaction)}')
+                n_edits += 1
+            else:
+                if debug:
+                    raise Exception(f'FOLLOWING EDIT UNCONFIRMED: {edit} at {_decode(old_line)}')
+                report(f'**WARNING: THE FOLLOWING EDIT WAS NOT CONFIRMED**:')
+                report(f'\tTARGET: {_decode(old_line)}')
+                report(f'\tEDIT: {edit}')
 
     # -- Other Edits --
 
@@ -238,7 +611,7 @@ def patch_parallel(data_dir='source', output_dir='source/patched', silent=False,
     
     # first check that the edit still applies to current file
     exod = file2lines['02.Exodus.par']
-    if exod[16284] == 'Exod 1:10':
+    if exod[16284] == b'Exod 1:10':
         report('patching corrupt lines 16283-16289 in 02.Exodus.par...')
         fixed_lines = exod[:16283] + [exod[16285]] + exod[16288:]
         file2lines['02.Exodus.par'] = fixed_lines
@@ -256,7 +629,7 @@ def patch_parallel(data_dir='source', output_dir='source/patched', silent=False,
     # we do it here to avoid needed to adjust indices after the correction
     # listed subsequent to this one
     pss = file2lines['20.Psalms.par']
-    if pss[10848] == 'MTR':
+    if pss[10848] == b'MTR':
         report('patching double-orphaned lines in lines 10849-10851 of 20.Psalms.par (Ps 68:31)')
         ps68_31_patch = [pss[10848] + pss[10849] + pss[10850]]
         file2lines['20.Psalms.par'] = pss[:10848] + ps68_31_patch + pss[10851:] 
@@ -270,7 +643,7 @@ def patch_parallel(data_dir='source', output_dir='source/patched', silent=False,
     # An identical corruption to the one discussed above in Exodus 35:15
     # likewise in 20.Psalms.par lines 2455-2459
     pss = file2lines['20.Psalms.par'] # rename to resume corrected data
-    if pss[2459] == 'Ps 18:40':
+    if pss[2459] == b'Ps 18:40':
         report('patching corrupt lines 2457-2461 in 20.Psalms.par...')
         fixed_lines = pss[:2456] + [pss[2457]] + pss[2460:]
         file2lines['20.Psalms.par'] = fixed_lines
@@ -284,8 +657,8 @@ def patch_parallel(data_dir='source', output_dir='source/patched', silent=False,
     # There is repeated material in Ezek, lines 20600-20607 (Ezek 47:20)
     # We repair that here
     ezek = file2lines['44.Ezekiel.par']
-    if '     ' in ezek[20599]:
-        ezek[20599] = "--+ =:XMT\tHMAQ"
+    if b'     ' in ezek[20599]:
+        ezek[20599] = b"--+ =:XMT\tHMAQ"
         fix = ezek[:20600] + ezek[20607:]
         file2lines['44.Ezekiel.par'] = fix
         n_edits += 1
@@ -320,208 +693,41 @@ def patch_parallel(data_dir='source', output_dir='source/patched', silent=False,
     # for all text beginning with book names and preceded by a newline
     # will need a regex pattern that can differentiate genuine booknames and text
 
-    report('patching orphaned lines (see code for description)...')
-
-    current_verse = None
-    for file, lines in file2lines.items():
-
-        filtered_lines = []
-
-        i = 0
-        while i < len(lines):
-
-            line = lines[i]
-
-            # track references and keep them
-            if ref_string.match(line):
-                current_verse = line
-                filtered_lines.append(line)
-            
-            # apply corrections to relevant lines
-            elif line and '\t' not in line:
-                
-                # append to log and report which lines are involved
-                show = f'\n\t\t{lines[i-1]}\n\t--> {line}\n\t\t{lines[i+1]}'
-                report(f'\tpatching {file} at line {i}, {current_verse}:{show}')
-                n_edits += 1
+    # -- Orphan Repair and Normalization Pass --
 
-                # shift line down to HB col if it's in Psalms
-                if current_verse.startswith('Ps'):
-                    filtered_lines.append(line+lines[i+1])
-                    i += 1 # shift forward 1 extra to skip already-covered line
+    # the normalizations are listed in `normalizations` at module level, above
 
-                # otherwise shift it up to GK col
-                else:
-                    filtered_lines[-1] = filtered_lines[-1] + line
+    # orphan repair and the bulk normalizations are applied in a single walk
+    # over each file; a kept line is held back as `pending` until the next
+    # kept line arrives, so that any orphans are merged into it before the
+    # normalizations run on the completed line in their listed order;
+    # files are independent, so each is handled in a worker process by _patch_file
 
-            # keep everything else unchanged            
-            else:
-                filtered_lines.append(line) 
+    report('patching orphaned lines (see code for description)')
+    report('and making various bulk regex normalizations...\n')
 
-            # advance the position 
-            i += 1
+    char_normalizations, _, normalizations, _ = _NORMS_COMPILED
+    pattern_hits = [0] * (len(char_normalizations) + len(normalizations))
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(_patch_file, file2lines.keys(), file2lines.values())
 
-        # reassign to new lines
-        file2lines[file] = filtered_lines
+        # gather the results in file order so the log reads as a sequential run
+        for file, new_lines, file_log, file_edits, file_hits in results:
+            file2lines[file] = new_lines
+            for msg in file_log:
+                report(msg)
+            n_edits += file_edits
+            pattern_hits = [a+b for a, b in zip(pattern_hits, file_hits)]
 
     report('\tdone')
 
-    # -- Bulk Normalizations -- 
-    
-    # changes which need to be effected systematically are loaded into tuples:
-    # (regex, replace)
-    # the changes are enacted with regex substitutions
-    # not all of these are stricly errors (though they may be), there 
-    # are numerous cases of normalizations applied to bring idiosyncratic
-    # patterns in line with the majority
-
-    # NB that the order of some changes matters, since some patterns are 
-    # dependent on other idiosyncracies being fixed already
-    normalizations = [
-        ('~', '^'),
-        ('----\+---', "--- ''"), # see 2 Chr 27:8
-        ("---\+", "--+"),
-        ("<([^\s>]*)(\s)(?!.*[>#])", '<\g<1>>\g<2>'), # numerous unclosed brackets
-
-        # NB: on below, cases of `{..`; some cases may be ambiguous whether they should be 
-        # {... or {..^ However, it is the stated preference of the docs that 
-        # during encoding {... is to be preferred (1986:7.6)
-        # and it also seems that several of the examples have a majority 
-        # preference of {... over {..^; thus we go with the former
-        ('{\.\.(?![.^a-z])', '{...'),
-        ('\.\.\.\.', '...'),
-        ('\(!\)', '{!}'), # (!) to {i}, inf. abs.
-        ('(?<![-*])\-\+', '--+'), # -+ to --+
-        ('A(?=.*\t)', ''), # vowels in the Hebrew column, replace with nothing
-        ('=&p', '=%p'), # =&p typo for =%p, preposition differences
-        ('(?<!-)--(?![-+])', '---'), # -- to ---
-        ('=a', '=@a'),
-
-        # NB order of this block matters, to ensure space to left of =
-        ('=%p=', '=%p-'),
-        ('([:;])=', '=\g<1>'), # e.g. := to =:
-        ('([^A-Z\/()\s|{}])=', '\g<1> ='), # ensure space to left of = (col.B marker)
-    
-        # this is case of ellision with interruption
-        # it would be more consistent to code it as a separate {...} remark
-        # so we close the previous brace and adda second
-        ('(?<![{\[])\.\.\.(?![}\]])', '}{...'),
-        
-        ('=%pa', '=%vpa'),
-        ('-%vap', '=%vap'),
-        ('{\.\.\.r', '{..r'),
-        ('=p(?=[\s-])', '=%p'),
-        ('<Sp>', '<sp>'),
-        ('=vpa', '=%vpa'),
-        ('{d}%p(\+?)', '%p\g<1> {d}'),
-        ('\+;', '=;'),
-        
-        ('=\?:', '=:?'),
-        ('={d};', '=;{d}'),
-
-        ('=p%([-+\s])', '=%p\g<1>'),
-        ('{d\t', '{d}\t'),
-        ('{15{', '{15}'),
-        ('\(\?5\)', '{?5}'), 
-        ('\[\.\.\.\]', '[..]'),
-        ('{(\d+)(\s)', '{\g<1>}\g<2>'),
-        ('(\s)(\d+)}', '\g<1>{\g<2>}'),
-        ('=%\?p(-?)', '=%p\g<1>?'),
-        (' ([a-z][a-z]) (?=.*\t)', ' .\g<1> '),
-        ('\(\.\.', '{..'),
-        (r'\\(?=.*\t)', '/'),
-
-        # order of block matters here
-        ('\[([a-zA-Z])}', '{\g<1>}'),
-        ('\[([\d.a-z]+)(?!.*\])', '[\g<1>]'),
-          
-        ('\s\s\s\s+', ' '),
-        ('{\.\.\.\^', '{..^'),
-        ('{\.\.\^\.', '{..^'),
-        ('{\.\.\.([a-z]+)', '{..\g<1>'),
-        ('{t\.}', '{t}'),
-        ('<t\?>', '{t?}'),
-        ('(\s)\?--\+(\s)', '\g<1>--+?\g<2>'),
-
-        # move question marks contained in brackets
-        # to the end of the brackets; this normalizes the `?`
-        # and allows us to treat them as external decorators
-        # rather than allowing them to interrupt a symbol
-        (r"{([^}]*)(\?\??)(.*?)}", "{\g<1>\g<3>}\g<2>"),
-
-        # normalize verse cross references in Hebrew portion
-        #('\[\[(.*[a-zA-Z]+.*\d\..*)\]\](?=.*\t)', '<\g<1>>'),
-        (r"\[\[(.+?)\]\](?=.*\t)", "<\g<1>>"),
-        (r"{dt}", "{d}{t}"),
-    
-        # move `?` to end of etymological exegesis symbol
-        (r"=@\?(\S*)a", "=@\g<1>a?"),
-
-        # close up unclosed curly brackets
-        (r"{([^\[}#]+)( +|$)(?!.*[}#])", "{\g<1>}\g<2>"),
-
-        (r"\^\^\^ \^ ''", "^^^ ^"),
-        (r"=([A-Z()/&$+]+)a", "=@\g<1>a"),
-    
-        # change brackets of cross references in Hebrew portion to <>
-        # where <...> represents a 'note'
-        ("\[([^\]]*?\d[\]]*?)\](?=.*\t)", "<\g<1>>"),
-
-        # patch misplaced accents
-        (r"(\t.*)(\s)([()])(.)", "\g<1>\g<2>\g<4>\g<3>"),
-        (r"(\t.*)=\)", "\g<1>)="),
-        (r"\|=", "=|"),
-        (r"\|\)", ")|"),
-        (r"TO\|N", r"TO\\N"),
-        (r"KAI\|", r"KAI\\"),
-        (r"I\(MAT/TIA", "I(MA/TIA"),
-        (r"ZN=\|", "ZH=|"),
-        (r"H\)R=TAI", "H)=RTAI"),
-        (r"OY\)K", "OU)K"),
-        (r"EC/NOIS", "CE/NOIS"),
-        (r"TH=/S", "TH=S"),
-    ]
-
-    report('\nMaking various bulk regex normalizations...\n')
-
-    for search, replace in normalizations:
-
-        report(f'---- applying pattern `{search}` with replace `{replace}` ----')
-        search = re.compile(search) # compile for efficiency
-        pattern_successful = False
-
-        for file, lines in file2lines.items():
-        
-            new_lines = []
-            curr_verse = ''
-
-            for i,line in enumerate(lines):
-                
-                # track passages for reporting since line numbers have already changed
-                if ref_string.match(line):
-                    curr_verse = line
-
-                # apply substitutions
-                if search.findall(line):
-                    redaction = search.sub(replace, line)
-                    new_lines.append(redaction)
-                    report(f'  in {file} in {curr_verse}:')
-                    report(f'\tOLD: {line}')
-                    report(f'\tNEW: {redaction}')
-                    pattern_successful = True   
-                    n_edits += 1    
-                
-                # else keep line the same
-                else:
-                    new_lines.append(line)
-
-            file2lines[file] = new_lines
-
-        if not pattern_successful:
+    patterns = [char for char, _ in char_normalizations] + [search.pattern for search, *_ in normalizations]
+    for pattern, hits in zip(patterns, pattern_hits):
+        if not hits:
             if debug:
-                raise Exception(f'PATTERN NOT FOUND: {search}')
+                raise Exception(f'PATTERN NOT FOUND: {_decode(pattern)}')
             else:
-                report(f'WARNING, PATTERN NOT FOUND: {search}')
+                report(f'WARNING, PATTERN NOT FOUND: {_decode(pattern)}')
 
     # export the corrected files
     report(f'\nwriting patched data to {output_dir}')
@@ -529,14 +735,11 @@ def patch_parallel(data_dir='source', output_dir='source/patched', silent=False,
     if not output_dir.exists():
         output_dir.mkdir()
 
-    for file, lines in file2lines.items():
-        text = '\n'.join(lines)
-        file_path = output_dir.joinpath(file)
-        file_path.write_text(text)
+    _write_files(file2lines, output_dir)
 
     # write changes to a log file
     log_path = output_dir.joinpath('log.txt')
-    log_path.write_text(log)
+    log_path.write_text('\n'.join(log_parts) + '\n')
 
     report('\nDONE with all patches!')
     report(f'\ttotal edits: {n_edits}')
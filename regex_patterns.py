@@ -5,6 +5,9 @@ import regex
 # identify verse reference strings
 ref_string = regex.compile(r'^[A-Za-z1-9/]+ \d+:?\d*$')
 
+# the same, for raw lines read as bytes (see patch_catss.py)
+ref_bytes = regex.compile(ref_string.pattern.encode())
+
 # identify Hebrew transcription characters
 hchars = r')BGDHWZX+YKLMNS(PCQR&$T/'
 
@@ -0,0 +1,39 @@
+from patch_catss import _NORMS_COMPILED, _read_lines, _decode
+from pathlib import Path
+
+data = Path('source')
+
+# patch_catss skips a normalization on any line that lacks the pattern's
+# literal prefix; make sure every match of every pattern really does begin
+# with that prefix, so that a pattern edit cannot quietly disable itself
+
+char_normalizations, char_map, normalizations, any_normalization = _NORMS_COMPILED
+
+files = sorted(data.glob('*.par'))
+if not files:
+    raise Exception(f'no .par files found in {data}; run download_catss first')
+
+n_matches = [0] * len(normalizations)
+
+print('checking literal prefixes...')
+for file in files:
+    print(f'\tchecking {file.name}')
+    for line in _read_lines(file):
+
+        # feed each pattern the line as it stands at that point in the
+        # patching, i.e. after the preceding normalizations
+        line = line.translate(char_map)
+        for i, (search, replace, prefix) in enumerate(normalizations):
+            for match in search.finditer(line):
+                n_matches[i] += 1
+                if not line.startswith(prefix, match.start()):
+                    raise Exception(
+                        f'pattern `{_decode(search.pattern)}` matched `{_decode(match.group(0))}` '
+                        f'without its literal prefix `{_decode(prefix)}` in {file.name}: {_decode(line)}'
+                    )
+            line = search.sub(replace, line)
+
+# show the prefixes that were checked
+print()
+for (search, _, prefix), n in zip(normalizations, n_matches):
+    print(f'{n:>6} matches\t{_decode(prefix)!r:<14}{_decode(search.pattern)}')